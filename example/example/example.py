@@ -7,7 +7,7 @@ import uuid
 
 import pynecone as pc
 import sqlalchemy
-from sqlmodel import col, or_
+from sqlmodel import func, or_
 
 from pynecone_admin import auth, crud
 from pynecone_admin.auth_models import pca_AuthSession, pca_User
@@ -77,16 +77,20 @@ class Stuff(pc.Model, table=True):
             print("filter where f3 is False")
             return cls.f3 == False
         print(f"filter prefix match for {filter_value}")
-        return or_(
-            col(cls.f1).ilike(f"{filter_value}%"),
-            *[
-                col(selected_column).cast(sqlalchemy.String).ilike(f"{filter_value}%")
-                for selected_column in [cls.f2, cls.f4]
-            ],
-        )
+        # compare typed columns directly, so no column needs a per-row CAST
+        clauses = [func.lower(cls.f1).like(f"{filter_value.lower()}%")]
+        try:
+            clauses.append(cls.f2 == int(filter_value))
+        except ValueError:
+            pass
+        if filter_value in F4.__members__:
+            clauses.append(cls.f4 == F4[filter_value])
+        return or_(*clauses)
 
 
-Stuff.__pynecone_admin_fields__ = [f for f in Stuff.__fields__ if f != "hidden"]
+# case-insensitive prefix matches on f1 can use this index
+sqlalchemy.Index("ix_stuff_f1_lower", func.lower(Stuff.__table__.c.f1))
+Stuff.__pynecone_admin_fields__ = crud.admin_fields(Stuff, exclude=("hidden",))
 
 
 @auth.authenticated_user_id
@@ -94,16 +98,13 @@ class State(pc.State):
     @pc.cached_var
     def authenticated_user(self) -> pca_User:
         if self.authenticated_user_id >= 0:
-            with pc.session() as session:
-                logger.debug(
-                    getattr(self, "get_current_page")()
-                    + f" Lookup authenticated_user_id: {self.authenticated_user_id}"
-                )
-                user = session.exec(
-                    pca_User.select.where(pca_User.id == self.authenticated_user_id)
-                ).one_or_none()
-                if user:
-                    return user
+            logger.debug(
+                getattr(self, "get_current_page")()
+                + f" Lookup authenticated_user_id: {self.authenticated_user_id}"
+            )
+            user = auth.get_authenticated_user(self.current_token)
+            if user:
+                return user
         return pca_User()
 
 
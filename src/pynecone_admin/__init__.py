@@ -1,12 +1,19 @@
-from .auth import authenticated_user_id, default_login_component, login_required
+from .auth import (
+    authenticated_user_id,
+    default_login_component,
+    get_authenticated_user,
+    login_required,
+)
 from .auth_models import pca_AuthSession, pca_User
-from .crud import add_crud_routes
+from .crud import add_crud_routes, admin_fields
 
 __all__ = [
     "pca_AuthSession",
     "pca_User",
     "add_crud_routes",
+    "admin_fields",
     "authenticated_user_id",
     "default_login_component",
+    "get_authenticated_user",
     "login_required",
 ]
\ No newline at end of file
@@ -2,17 +2,21 @@
 from __future__ import annotations
 
 import datetime
+import itertools
 import logging
 import typing as t
 
 import pynecone as pc
+import sqlalchemy
 import sqlmodel
 
 from .auth_models import pca_AuthSession, pca_User
 from .persistent_token import PersistentToken
 from .utils import (
+    add_backend_var,
     add_computed_var,
     add_event_handler,
+    db_session,
     debounce_input,
     fix_local_event_handlers,
 )
@@ -22,6 +26,108 @@ logger = logging.getLogger(__name__)
 
 
 DEFAULT_AUTH_SESSION_EXPIRATION_DELTA = datetime.timedelta(days=7)
+# how long to trust a cached token lookup before consulting the database again
+AUTH_CACHE_DELTA = datetime.timedelta(minutes=1)
+# how long to remember that a token has no associated auth session
+NEGATIVE_AUTH_CACHE_DELTA = datetime.timedelta(seconds=30)
+# maximum number of tokens remembered by the auth cache
+AUTH_CACHE_SIZE = 10_000
+# delete expired auth sessions once every N logouts
+EXPIRED_AUTH_SESSION_PURGE_INTERVAL = 100
+
+_logout_counter = itertools.count(1)
+
+# session_id -> (user_id, expiration)
+_AUTH_CACHE: dict[str, tuple[int, datetime.datetime]] = {}
+
+
+def _utcnow() -> datetime.datetime:
+    """Get the current time in UTC."""
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _cache_auth_session(
+    session_id: str,
+    user_id: int,
+    expiration: datetime.datetime,
+) -> None:
+    """Remember the user_id associated with session_id until expiration."""
+    if expiration.tzinfo is None:
+        # sqlite does not persist the timezone, values are always stored as UTC
+        expiration = expiration.replace(tzinfo=datetime.timezone.utc)
+    expiration = min(
+        expiration,
+        _utcnow() + AUTH_CACHE_DELTA,
+    )
+    if session_id not in _AUTH_CACHE and len(_AUTH_CACHE) >= AUTH_CACHE_SIZE:
+        # evict the oldest entry
+        _uncache_auth_session(next(iter(_AUTH_CACHE)))
+    _AUTH_CACHE[session_id] = (user_id, expiration)
+
+
+def _uncache_auth_session(session_id: str) -> None:
+    """Forget any cached lookup for session_id."""
+    _AUTH_CACHE.pop(session_id, None)
+
+
+@sqlalchemy.event.listens_for(pca_AuthSession, "after_delete")
+@sqlalchemy.event.listens_for(pca_AuthSession, "after_update")
+def _uncache_changed_auth_session(mapper, connection, target) -> None:
+    """Forget cached lookups for an auth session deleted or modified via the ORM."""
+    _uncache_auth_session(target.session_id)
+    for session_id in sqlalchemy.inspect(target).attrs.session_id.history.deleted:
+        _uncache_auth_session(session_id)
+
+
+def _lookup_auth_session(token: str) -> int:
+    """
+    Query the auth session for token and cache the result.
+
+    Returns:
+        The user_id of the non-expired auth session, or -1 if there is none.
+    """
+    with db_session() as session:
+        # the session columns are read directly, without hydrating a model
+        row = session.exec(
+            sqlmodel.select(pca_AuthSession.user_id, pca_AuthSession.expiration,).where(
+                pca_AuthSession.session_id == token,
+                pca_AuthSession.expiration >= sqlalchemy.func.now(),
+            ),
+        ).first()
+        if row is not None:
+            user_id, expiration = row
+            _cache_auth_session(token, user_id, expiration)
+            return user_id
+    _cache_auth_session(token, -1, _utcnow() + NEGATIVE_AUTH_CACHE_DELTA)
+    return -1
+
+
+def get_authenticated_user(token: str) -> pca_User | None:
+    """
+    Get the pca_User associated with the auth session for the given token.
+
+    Only the session's user_id is cached, so checking
+    `State.authenticated_user_id` first avoids querying the auth session
+    again. The user itself is always read from the database, so changes to
+    `enabled` or `admin` take effect immediately.
+
+    Args:
+        token: the state's current_token
+
+    Returns:
+        The (detached) user, or None if the token is not associated with a
+        non-expired auth session for a pca_User.
+    """
+    cached = _AUTH_CACHE.get(token)
+    if cached is None or cached[1] < _utcnow():
+        # evicted, expired or looked up by another process
+        user_id = _lookup_auth_session(token)
+    else:
+        user_id = cached[0]
+    if user_id < 0:
+        return None
+    with db_session() as session:
+        return session.get(pca_User, user_id)
 
 
 def authenticated_user_id(State: t.Type[pc.State]) -> t.Type[pc.State]:
@@ -39,11 +145,19 @@ def authenticated_user_id(State: t.Type[pc.State]) -> t.Type[pc.State]:
       when calling `State._login(self, valid_user_id)`
     * Add `authenticated_user_id` int var associated with the session
         (`-1` for no authenticated user)
+
+    This augments State in place rather than being provided as a mixin class:
+    pynecone derives the state tree from class inheritance and only allows a
+    single parent State, so a `pc.State` mixin cannot be combined with the app
+    state. The vars and handlers are registered once; decorating an already
+    augmented State (or a subclass of one) is a no-op.
     """
     if getattr(State, "authenticated_user_id", None) is not None:
         return State
 
     State.add_var("persistent_token", type_=str, default_value="")
+    # incremented to recompute authenticated_user_id after login/logout
+    add_backend_var(State, "_auth_epoch", 0)
 
     @add_event_handler(State)
     def set_persistent_token(self, persistent_token):
@@ -51,15 +165,33 @@ def authenticated_user_id(State: t.Type[pc.State]) -> t.Type[pc.State]:
             # only re-assign if the new value is different
             self.persistent_token = persistent_token
 
+    def _end_auth_session(self, purge_expired: bool = False):
+        with db_session() as session:
+            session.execute(
+                sqlalchemy.delete(pca_AuthSession).where(
+                    pca_AuthSession.session_id == self.current_token,
+                ),
+            )
+            if purge_expired:
+                session.execute(
+                    sqlalchemy.delete(pca_AuthSession).where(
+                        pca_AuthSession.expiration < sqlalchemy.func.now(),
+                    ),
+                )
+            session.commit()
+        _uncache_auth_session(self.current_token)
+        self._auth_epoch += 1
+
     @add_event_handler(State)
     def do_logout(self):
-        with pc.session() as session:
-            for auth_session in session.exec(
-                pca_AuthSession.select.where(pca_AuthSession.session_id == self.current_token)
-            ).all():
-                session.delete(auth_session)
-            session.commit()
-        self.persistent_token = self.persistent_token
+        # opportunistically clean up sessions that can never be used again,
+        # counting only explicit logouts (not the logout performed by _login)
+        _end_auth_session(
+            self,
+            purge_expired=(
+                next(_logout_counter) % EXPIRED_AUTH_SESSION_PURGE_INTERVAL == 0
+            ),
+        )
 
     def _login(
         self,
@@ -70,18 +202,23 @@ def authenticated_user_id(State: t.Type[pc.State]) -> t.Type[pc.State]:
             return
         if user_id < 0:
             return
-        do_logout(self)
-        with pc.session() as session:
+        if not self.persistent_token:
+            # authenticated_user_id only recognizes sessions for a persistent token
+            logger.warning("Cannot login before the persistent_token is set")
+            return
+        _end_auth_session(self)
+        expiration = _utcnow() + expiration_delta
+        with db_session() as session:
             session.add(
                 pca_AuthSession(
                     user_id=user_id,
                     session_id=self.current_token,
-                    expiration=datetime.datetime.now(datetime.timezone.utc)
-                    + expiration_delta,
+                    expiration=expiration,
                 )
             )
             session.commit()
-        self.persistent_token = self.persistent_token
+        _cache_auth_session(self.current_token, user_id, expiration)
+        self._auth_epoch += 1
 
     State._login = _login
 
@@ -94,24 +231,22 @@ def authenticated_user_id(State: t.Type[pc.State]) -> t.Type[pc.State]:
     @add_computed_var(State)
     @pc.cached_var
     def authenticated_user_id(self) -> int:
-        with pc.session() as session:
-            s = session.exec(
-                pca_AuthSession.select.where(
-                    pca_AuthSession.session_id == self.current_token,
-                    pca_AuthSession.expiration
-                    >= datetime.datetime.now(datetime.timezone.utc),
-                ),
-            ).first()
-            if s:
-                return s.user_id
-        return -1
+        if not self.persistent_token:
+            # anonymous client (or not hydrated yet), recomputed when the token is set
+            return -1
+        token = self.persistent_token
+        self._auth_epoch  # dependency: recompute after login/logout
+        # dependency: re-validate on navigation, so an expired or revoked session
+        # is noticed once the cached lookup is older than AUTH_CACHE_DELTA
+        self.get_current_page()
+        cached = _AUTH_CACHE.get(token)
+        if cached is not None and cached[1] >= _utcnow():
+            return cached[0]
+        return _lookup_auth_session(token)
 
     return State
 
 
-LOGIN_STATE_FOR_STATE = {}
-
-
 def LoginStateFor(State: t.Type[pc.State]) -> t.Type[pc.State]:
     """
     Create a "LoginState" as a substate of the given state class.
@@ -124,6 +259,10 @@ def LoginStateFor(State: t.Type[pc.State]) -> t.Type[pc.State]:
     Args:
         State: the state class to create a substate for (typically, app.state)
     """
+    # check the class __dict__, a subclass of State needs its own LoginState
+    login_state = State.__dict__.get("_pca_login_state")
+    if login_state is not None:
+        return login_state
 
     def _create_first_admin_user(
         session: sqlmodel.Session,
@@ -142,52 +281,63 @@ def LoginStateFor(State: t.Type[pc.State]) -> t.Type[pc.State]:
         logger.warning(f"Created first new admin user: {username}")
         return user
 
-    if State not in LOGIN_STATE_FOR_STATE:
-
-        @fix_local_event_handlers
-        class LoginState(State):
-            username: str = ""
-            password: str = ""
-            error_message: str = ""
-
-            def on_submit(self):
-                self.error_message = ""
-                with pc.session() as session:
-                    user = session.exec(
-                        pca_User.select.where(pca_User.username == self.username)
-                    ).one_or_none()
-                    if user is None:
-                        # if this is the first time logging in, create the user and make them admin
-                        if session.exec(pca_User.select.limit(1)).one_or_none() is None:
-                            user = _create_first_admin_user(
-                                session,
-                                self.username,
-                                self.password,
-                            )
-                if user is not None and user.enabled and user.verify(self.password):
-                    # mark the user as logged in
-                    State._login(self, user.id)
-                if user is not None and not user.enabled:
-                    self.password = ""
-                    return type(self).set_error_message("This account is disabled.")
-                if user is None or not user.verify(self.password):
-                    self.password = ""
-                    return type(self).set_error_message(
-                        "There was a problem logging in, please try again.",
-                    )
-                self.username = self.password = ""
-
-        LOGIN_STATE_FOR_STATE[State] = LoginState
-    return LOGIN_STATE_FOR_STATE[State]
+    @fix_local_event_handlers
+    class LoginState(State):
+        username: str = ""
+        password: str = ""
+        error_message: str = ""
+
+        def on_submit(self):
+            self.error_message = ""
+            with db_session() as session:
+                user = session.exec(
+                    pca_User.select.where(pca_User.username == self.username)
+                ).one_or_none()
+                if user is None:
+                    # if this is the first time logging in, create the user and make them admin
+                    if session.exec(pca_User.select.limit(1)).one_or_none() is None:
+                        user = _create_first_admin_user(
+                            session,
+                            self.username,
+                            self.password,
+                        )
+                verified = (
+                    user is not None and user.enabled and user.verify(self.password)
+                )
+                if verified and session.is_modified(user):
+                    # verify upgraded a deprecated password hash, save it
+                    session.commit()
+                    session.refresh(user)
+            if verified:
+                # mark the user as logged in
+                State._login(self, user.id)
+            if user is not None and not user.enabled:
+                self.password = ""
+                return type(self).set_error_message("This account is disabled.")
+            if not verified:
+                self.password = ""
+                return type(self).set_error_message(
+                    "There was a problem logging in, please try again.",
+                )
+            self.username = self.password = ""
+
+    State._pca_login_state = LoginState
+    return LoginState
 
 
 def default_login_component(State: t.Type[pc.State]) -> pc.Component:
     """
     Handle local pca_User model logins.
 
+    The component is built once per State and reused by every page.
+
     Args:
         State: the state class for the app
     """
+    login_component = State.__dict__.get("_pca_login_component")
+    if login_component is not None:
+        return login_component
+
     LoginState = LoginStateFor(State)
 
     login_form = pc.form(
@@ -209,7 +359,7 @@ def default_login_component(State: t.Type[pc.State]) -> pc.Component:
         on_submit=LoginState.on_submit,
     )
 
-    return pc.cond(
+    State._pca_login_component = pc.cond(
         LoginState.is_hydrated == False,
         pc.vstack(
             pc.text("Connecting to Backend"),
@@ -225,6 +375,7 @@ def default_login_component(State: t.Type[pc.State]) -> pc.Component:
             padding_top="10vh",
         ),
     )
+    return State._pca_login_component
 
 
 def login_required(
@@ -1,15 +1,59 @@
+import collections
 import datetime
+import functools
+import hmac
 
 from passlib.context import CryptContext
 import pynecone as pc
-from sqlmodel import Column, DateTime, Field, func
+from sqlmodel import Column, DateTime, Field, Index, func
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# new hashes use argon2id, existing bcrypt hashes still verify and are upgraded on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+# number of recent successful password verifications to remember
+VERIFY_CACHE_SIZE = 512
+
+
+def cache_successful_verify(verify):
+    """
+    Remember recent successful verifications of a (password_hash, secret) pair.
+
+    Repeated logins with the same credentials skip the (intentionally slow)
+    password hash. Failed verifications are never cached, and the cache key
+    is derived from the password_hash, so changing the password invalidates
+    any previous entry.
+    """
+    cache = collections.OrderedDict()
+
+    @functools.wraps(verify)
+    def wrapper(self, secret: str) -> bool:
+        key = hmac.new(
+            self.password_hash.encode(),
+            secret.encode(),
+            "blake2b",
+        ).digest()
+        if key in cache:
+            cache.move_to_end(key)
+            return True
+        verified = verify(self, secret)
+        if verified:
+            cache[key] = None
+            if len(cache) > VERIFY_CACHE_SIZE:
+                cache.popitem(last=False)
+        return verified
+
+    return wrapper
 
 
 class pca_User(pc.Model, table=True):
-    """A local User model with bcrypt password hashing."""
+    """A local User model with argon2 (or legacy bcrypt) password hashing."""
 
     username: str = Field(unique=True, nullable=False, index=True)
     password_hash: str = Field(nullable=False)
@@ -18,15 +62,24 @@ class pca_User(pc.Model, table=True):
 
     def do_hash_password(self):
         """Rehash the value of password_hash is not an identifiable password hash."""
-        if not pwd_context.identify(self.password_hash):
+        if pwd_context.identify(self.password_hash, required=False) is None:
             self.password_hash = pwd_context.hash(self.password_hash)
 
+    @cache_successful_verify
     def verify(self, secret: str) -> bool:
-        """Returns True if the secret matches this user's password_hash."""
-        return pwd_context.verify(
+        """
+        Returns True if the secret matches this user's password_hash.
+
+        A matching hash that uses a deprecated scheme (bcrypt) is replaced with
+        an argon2 hash of the secret; the caller is responsible for persisting it.
+        """
+        verified, new_hash = pwd_context.verify_and_update(
             secret,
             self.password_hash,
         )
+        if new_hash is not None:
+            self.password_hash = new_hash
+        return verified
 
     # Tell pynecone-admin to hash the password when saving this object
     __pynecone_admin_save_object_hook__ = do_hash_password
@@ -35,6 +88,11 @@ class pca_User(pc.Model, table=True):
 class pca_AuthSession(pc.Model, table=True):
     """Correlate a session_id with an arbitrary user_id."""
 
+    # cover the authenticated_user_id lookup, so it can be answered from the index
+    __table_args__ = (
+        Index("ix_auth_session_lookup", "session_id", "expiration", "user_id"),
+    )
+
     user_id: int = Field(index=True, nullable=False)
     session_id: str = Field(unique=True, index=True, nullable=False)
     expiration: datetime.datetime = Field(
@@ -46,5 +104,5 @@ class pca_AuthSession(pc.Model, table=True):
         """Convert the object to a serializable dictionary."""
         d = super().dict(*args, **kwargs)
         if self.expiration:
-            d["expiration"] = self.expiration.replace(microsecond=0).isoformat()
+            d["expiration"] = self.expiration.isoformat(timespec="seconds")
         return d
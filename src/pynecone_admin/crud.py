@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import datetime
 import enum
+import functools
 import json
 import logging
-import time
+import types
 import typing as t
 import urllib.parse
 import uuid
@@ -13,11 +14,16 @@ import pydantic
 import pynecone as pc
 from pynecone import utils
 import sqlalchemy
+from sqlalchemy.dialects import postgresql
 from sqlmodel import col, or_
 
 from .auth import login_required
 from .components.select import Option, Select
-from .utils import color_mode, debounce_input, fix_local_event_handlers
+from .utils import (
+    color_mode,
+    db_session,
+    debounce_input,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -27,7 +33,24 @@ QUERY_PARAM_DEFAULTS = {
     "page_size": 10,
     "offset": 0,
     "filter": "",
+    # keyset pagination bounds, the id of the row before/after the page
+    "after_id": "",
+    "before_id": "",
 }
+# known query param names -> name used in the URL
+_QUERY_STRING_KEYS = {
+    key: key.replace("_", "-") for key in [*QUERY_PARAM_DEFAULTS, "obj_id"]
+}
+# default filter expressions cached per model
+FILTER_CACHE_SIZE = 256
+
+
+def _int_query_param(query_params: dict[str, t.Any], key: str) -> int:
+    """Parse an int query param, falling back to its default if missing or invalid."""
+    try:
+        return int(query_params[key])
+    except (KeyError, ValueError):
+        return QUERY_PARAM_DEFAULTS[key]
 
 
 class FormComponent(t.Protocol):
@@ -55,6 +78,180 @@ class FieldComponent(t.Protocol):
         ...
 
 
+def _text_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    return debounce_input(
+        pc.input(
+            placeholder=field.name,
+            value=value.to(str) | "",
+            on_change=on_change,
+            **kwargs,
+        ),
+    )
+
+
+def _uuid_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    return pc.hstack(
+        _text_control(field, value, on_change, **kwargs),
+        pc.button(
+            "🎲",
+            on_click=lambda: on_change("random"),
+        ),
+    )
+
+
+def _datetime_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    return pc.hstack(
+        debounce_input(
+            pc.input(
+                type_="datetime-local",
+                placeholder=field.name,
+                value=value.to(str) | "",
+                on_change=on_change,
+                **kwargs,
+            ),
+            custom_attrs={"step": "1"},
+        ),
+        pc.button(
+            "Now",
+            on_click=lambda: on_change("now"),
+        ),
+    )
+
+
+def _enum_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    options = [
+        Option.create(f"{key}: {enum_value.value}", value=key)
+        for key, enum_value in field.type_.__members__.items()
+    ]
+    return Select.create(
+        *options,
+        value=value.to(str) | "",
+        on_change=on_change,
+        placeholder=repr(field.type_),
+        **kwargs,
+    )
+
+
+def _bool_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    return pc.checkbox(
+        value.to_string(),
+        is_checked=value,
+        on_change=on_change,
+        **kwargs,
+    )
+
+
+def _int_control(
+    field: pydantic.Field, value: t.Any, on_change: t.Any, **kwargs: t.Any
+) -> pc.Component:
+    if field.default is not None and not field.allow_none:
+        # never null: blank objects start at the default and None is rejected
+        return pc.number_input(
+            input_mode="numeric", value=value, on_change=on_change, **kwargs
+        )
+    return pc.number_input(
+        input_mode="numeric",
+        value=value | "",
+        on_change=on_change,
+        **kwargs,
+    )
+
+
+# (base type, control) in order of precedence for subclasses
+_FIELD_CONTROLS: list[tuple[type, t.Callable[..., pc.Component]]] = [
+    (str, _text_control),
+    (float, _text_control),
+    (uuid.UUID, _uuid_control),
+    (datetime.datetime, _datetime_control),
+    (enum.Enum, _enum_control),
+    (bool, _bool_control),
+    (int, _int_control),
+]
+# field type -> control, populated on first use of each type
+_FIELD_CONTROL_FOR_TYPE: dict[type, t.Callable[..., pc.Component] | None] = dict(
+    _FIELD_CONTROLS
+)
+
+
+def _field_control_for_type(type_: type) -> t.Callable[..., pc.Component] | None:
+    """Find the control for the given field type, or None if it is unsupported."""
+    try:
+        return _FIELD_CONTROL_FOR_TYPE[type_]
+    except KeyError:
+        pass
+    control = None
+    # typing constructs (e.g. Literal) are not classes, issubclass would raise
+    if isinstance(type_, type):
+        for base, base_control in _FIELD_CONTROLS:
+            if issubclass(type_, base):
+                control = base_control
+                break
+    _FIELD_CONTROL_FOR_TYPE[type_] = control
+    return control
+
+
+def _parse_number(type_: type, value: t.Any) -> t.Any:
+    # cast directly as the type_
+    return type_(value)
+
+
+def _parse_enum(type_: t.Type[enum.Enum], value: t.Any) -> enum.Enum:
+    return type_.__members__[value]
+
+
+def _parse_datetime(type_: type, value: t.Any) -> datetime.datetime:
+    if value == "now":
+        # TODO: sane timezone handling?
+        return datetime.datetime.now()
+    return datetime.datetime.fromisoformat(value)
+
+
+def _parse_uuid(type_: type, value: t.Any) -> uuid.UUID:
+    if value == "random":
+        return uuid.uuid4()
+    try:
+        # try to parse uuid from int, falling back to str or whatever
+        return uuid.UUID(int=int(value))
+    except ValueError:
+        return uuid.UUID(value)
+
+
+# (base type, parser) applied in this order to values set from the form,
+# parsers raise KeyError, TypeError or ValueError for invalid input
+_VALUE_PARSERS: list[tuple[type | tuple[type, ...], t.Callable[..., t.Any]]] = [
+    ((int, float), _parse_number),
+    (enum.Enum, _parse_enum),
+    (datetime.datetime, _parse_datetime),
+    (uuid.UUID, _parse_uuid),
+]
+# exact types whose constructor is the whole conversion
+_COERCERS: dict[type, t.Callable[[t.Any], t.Any]] = {int: int, float: float}
+
+
+@functools.lru_cache(maxsize=None)
+def _value_parsers(type_: type) -> tuple[t.Callable[[t.Any], t.Any], ...]:
+    """The parsers that convert a form value to a field of the given type."""
+    if not isinstance(type_, type):
+        return ()
+    if type_ in _COERCERS:
+        return (_COERCERS[type_],)
+    return tuple(
+        functools.partial(parser, type_)
+        for base, parser in _VALUE_PARSERS
+        if issubclass(type_, base)
+    )
+
+
 def default_field_component(
     field: pydantic.Field,
     value: t.Any,
@@ -65,6 +262,28 @@ def default_field_component(
     kwargs["is_required"] = kwargs.pop("is_required", field.required)
     attrs_if_required = {"color": "red"} if field.required else {}
     field_name_and_type = field.name + f" ({field.type_.__name__})"
+    # XXX: support alternative primary keys
+    if field.name == "id":
+        # no resetting of id, so the label is just the name
+        return pc.form_control(
+            pc.form_label(field_name_and_type),
+            pc.cond(
+                value,
+                pc.input(
+                    is_read_only=True,
+                    value=value.to_string().to(str),
+                    **kwargs,
+                ),
+                pc.input(
+                    is_read_only=True,
+                    value="(new)",
+                    **kwargs,
+                ),
+            ),
+        )
+    control = _field_control_for_type(field.type_)
+    if control is None:
+        return pc.text(f"Unsupported field: {field.name} ({field.type_})", **kwargs)
     if field.default is None:
         value_is_default = value.to_string() == "null"
     else:
@@ -85,100 +304,28 @@ def default_field_component(
             ),
         ),
     )
-    input_control = None
-    # XXX: support alternative primary keys
-    if field.name == "id":
-        label = pc.form_label(field_name_and_type)  # no resetting of id
-        input_control = pc.cond(
-            value,
-            pc.input(
-                is_read_only=True,
-                value=value.to_string().to(str),
-                **kwargs,
-            ),
-            pc.input(
-                is_read_only=True,
-                value="(new)",
-                **kwargs,
-            ),
-        )
-    elif issubclass(field.type_, (str, float, uuid.UUID)):
-        input_control = debounce_input(
-            pc.input(
-                placeholder=field.name,
-                value=value.to(str) | "",
-                on_change=on_change,
-                **kwargs,
-            ),
-        )
-        if issubclass(field.type_, uuid.UUID):
-            input_control = pc.hstack(
-                input_control,
-                pc.button(
-                    "🎲",
-                    on_click=lambda: on_change("random"),
-                ),
-            )
-    elif issubclass(field.type_, datetime.datetime):
-        input_control = pc.hstack(
-            debounce_input(
-                pc.input(
-                    type_="datetime-local",
-                    placeholder=field.name,
-                    value=value.to(str) | "",
-                    on_change=on_change,
-                    **kwargs,
-                ),
-                custom_attrs={"step": "1"},
-            ),
-            pc.button(
-                "Now",
-                on_click=lambda: on_change("now"),
-            ),
-        )
-    elif issubclass(field.type_, enum.Enum):
-        options = [
-            Option.create(f"{key}: {enum_value.value}", value=key)
-            for key, enum_value in field.type_.__members__.items()
-        ]
-        input_control = Select.create(
-            *options,
-            value=value.to(str) | "",
-            on_change=on_change,
-            placeholder=repr(field.type_),
-            **kwargs,
-        )
-    elif issubclass(field.type_, bool):
-        input_control = pc.checkbox(
-            value.to_string(),
-            is_checked=value,
-            on_change=on_change,
-            **kwargs,
-        )
-    elif issubclass(field.type_, int):
-        input_control = pc.number_input(
-            input_mode="numeric",
-            value=value | "",
-            on_change=on_change,
-            **kwargs,
-        )
-    if input_control is None:
-        return pc.text(f"Unsupported field: {field.name} ({field.type_})", **kwargs)
-    return pc.form_control(label, input_control)
+    return pc.form_control(label, control(field, value, on_change, **kwargs))
 
 
-def format_query_string(params: dict[str, t.Any]) -> str:
+def format_query_string(
+    params: dict[str, t.Any] | t.Iterable[tuple[str, t.Any]]
+) -> str:
     """Convert query params to router string
 
     Args:
-        params: the query_params from router_data
+        params: the query_params from router_data, or (name, value) pairs
 
     Returns:
         The query string
     """
-    return urllib.parse.urlencode({k.replace("_", "-"): v for k, v in params.items()})
+    if isinstance(params, dict):
+        params = params.items()
+    return urllib.parse.urlencode(
+        [(_QUERY_STRING_KEYS.get(k) or k.replace("_", "-"), v) for k, v in params]
+    )
 
 
+@functools.lru_cache(maxsize=None)
 def fields(model_clz: t.Type[pc.Model]) -> dict[str, pydantic.Field]:
     selected_fields: list[str] = getattr(
         model_clz, "__pynecone_admin_fields__", model_clz.__fields__.keys()
@@ -186,6 +333,92 @@ def fields(model_clz: t.Type[pc.Model]) -> dict[str, pydantic.Field]:
     return {key: model_clz.__fields__[key] for key in selected_fields}
 
 
+@functools.lru_cache(maxsize=None)
+def _defaults_json(model_clz: t.Type[pc.Model]) -> dict[str, str]:
+    """JSON literal of each field default, used to reset fields in the form."""
+    return {
+        field_name: json.dumps(field.default)
+        for field_name, field in fields(model_clz).items()
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _field_var(obj_name: str, field_name: str, type_: type, state: str) -> pc.Var:
+    """Var referencing a field of the object var named obj_name."""
+    return pc.vars.BaseVar(name=f"{obj_name}.{field_name}", type_=type_, state=state)
+
+
+@functools.lru_cache(maxsize=None)
+def _local_var(name: str, type_: type) -> pc.Var:
+    """Var for a literal JS expression, such as a field default."""
+    return pc.vars.BaseVar(name=name, type_=type_, state="", is_local=True)
+
+
+def admin_fields(
+    model_clz: t.Type[pc.Model],
+    exclude: t.Container[str] = (),
+) -> tuple[str, ...]:
+    """Get the field names of model_clz, suitable for `__pynecone_admin_fields__`.
+
+    Args:
+        model_clz: the model class
+        exclude: names of fields to leave out
+
+    Returns:
+        Tuple of field names, in definition order
+    """
+    return tuple(f for f in model_clz.__fields__ if f not in exclude)
+
+
+def _default_filter_hook(
+    model_clz: t.Type[pc.Model],
+) -> t.Callable[[str], t.Any]:
+    """Build the filter used when model_clz does not define a filter where hook."""
+    search_column = getattr(model_clz, "__pynecone_admin_search_column__", None)
+    if isinstance(search_column, str):
+        search_column = getattr(model_clz, search_column)
+    search_is_tsvector = search_column is not None and isinstance(
+        col(search_column).type, postgresql.TSVECTOR
+    )
+    # columns searched by the default filter, built once per model: string
+    # columns are matched as-is, so an index on them (e.g. pg_trgm GIN) is
+    # usable, and integer columns only when the filter is a number
+    string_columns = []
+    integer_columns = []
+    for field_name, field in fields(model_clz).items():
+        # select by python type: sqlmodel maps str to AutoString, a TypeDecorator
+        # rather than a sqlalchemy.String subclass
+        if field.type_ is str:
+            string_columns.append(col(getattr(model_clz, field_name)))
+        elif field.type_ is int:
+            integer_columns.append(col(getattr(model_clz, field_name)))
+
+    # the expressions only depend on filter_value, so recent ones are reused
+    # while paging through the same filtered table
+    @functools.lru_cache(maxsize=FILTER_CACHE_SIZE)
+    def default_filter_hook(filter_value):
+        if search_column is not None:
+            if search_is_tsvector:
+                return search_column.op("@@")(
+                    sqlalchemy.func.plainto_tsquery(filter_value)
+                )
+            return search_column.ilike(f"%{filter_value}%")
+        # default implementation scans the string columns
+        pattern = f"%{filter_value}%"
+        clauses = [column.ilike(pattern) for column in string_columns]
+        try:
+            number = int(filter_value)
+        except ValueError:
+            pass
+        else:
+            clauses.extend(column == number for column in integer_columns)
+        if not clauses:
+            return sqlalchemy.false()  # nothing can match
+        return or_(*clauses)
+
+    return default_filter_hook
+
+
 def add_crud_routes(
     app: pc.App,
     objs: t.Sequence[t.Type[pc.Model]],
@@ -221,58 +454,65 @@ def add_crud_routes(
             # otherwise, anyone can access the models
             return True
 
-    PER_MODEL_CRUD_STATES = {}
+    @functools.lru_cache(maxsize=None)
+    def table_route(model_clz: t.Type[pc.Model]) -> str:
+        """The formatted route of the table page for model_clz."""
+        return "/" + utils.format.format_route(f"{prefix}/{model_clz.__name__}")
 
     class CRUDState(app.state):
         pass
 
+    def keyset_id(query_params: dict[str, t.Any], key: str) -> int | None:
+        """Parse a keyset pagination bound from the query params, if any."""
+        try:
+            return int(query_params[key])
+        except (KeyError, ValueError):
+            return None
+
     def CRUDSubStateFor(model_clz: t.Type[pc.Model]) -> t.Type[pc.State]:
+        model_table_route = table_route(model_clz)
+        load_row_hook = getattr(model_clz, "__pynecone_admin_load_row_hook__", None)
+        batch_load_hook = getattr(model_clz, "__pynecone_admin_batch_load_hook__", None)
+        # field name -> parsers applied to values set from the form
+        field_parsers = {
+            field_name: _value_parsers(field.type_)
+            for field_name, field in model_clz.__fields__.items()
+        }
+        filter_where_hook = getattr(
+            model_clz, "__pynecone_admin_filter_where_hook__", None
+        )
+        default_filter_hook = _default_filter_hook(model_clz)
+
+        # user hooks are not cached, they may depend on more than filter_value
+        filter_hook = (
+            filter_where_hook if filter_where_hook is not None else default_filter_hook
+        )
+
         def set_subfield(self, field_name: str, value: str | None):
             if not can_access_resource(self):
                 return  # no changes unless you are admin
-            self.form_message = ""
-            field = self.current_obj.__fields__[field_name]
+            if self.form_message:
+                # only clear the message when set, every assignment is sent as a delta
+                self.form_message = ""
+            parsers = field_parsers[field_name]
             if value is not None:
-                if issubclass(field.type_, (int, float)):
-                    try:
-                        # cast directly as the type_
-                        value = field.type_(value)
-                    except ValueError as exc:
-                        self.form_message = str(exc)
-                        return
-                # special type initialization handling
-                if issubclass(field.type_, enum.Enum):
-                    try:
-                        value = field.type_.__members__[value]
-                    except KeyError as exc:
-                        self.form_message = str(exc)
-                        return
-                if issubclass(field.type_, datetime.datetime):
-                    if value == "now":
-                        # TODO: sane timezone handling?
-                        value = datetime.datetime.now()
-                    else:
-                        try:
-                            value = datetime.datetime.fromisoformat(value)
-                        except ValueError as exc:
-                            self.form_message = str(exc)
-                if issubclass(field.type_, uuid.UUID):
-                    if value == "random":
-                        value = uuid.uuid4()
-                    else:
-                        try:
-                            # try to parse uuid from int, falling back to str or whatever
-                            value = uuid.UUID(int=int(value))
-                        except ValueError:
-                            try:
-                                value = uuid.UUID(value)
-                            except ValueError as exc:
-                                self.form_message = str(exc)
-                                return
-            logger.debug(f"set_subfield({model_clz.__name__}) {field_name}={value}")
+                try:
+                    for parse in parsers:
+                        value = parse(value)
+                except (KeyError, TypeError, ValueError) as exc:
+                    self.form_message = str(exc)
+                    return
+            if getattr(self.current_obj, field_name) == value:
+                return  # unchanged, avoid sending a delta
+            logger.debug(
+                "set_subfield(%s) %s=%r", model_clz.__name__, field_name, value
+            )
             setattr(self.current_obj, field_name, value)
-            # re-assign to parent attribute
-            self.current_obj = self.current_obj
+            # flag the var as changed directly, re-assigning it to itself would go
+            # through the inherited var lookup and pydantic's __setattr__ first.
+            # pynecone deltas are per var, so the whole object is still sent
+            self.dirty_vars.add("current_obj")
+            self.mark_dirty()
 
         def load_current_obj(self):
             if not can_access_resource(self):
@@ -283,27 +523,24 @@ def add_crud_routes(
                 except ValueError:
                     self.reset()
                     return
-                with pc.session() as session:
+                with db_session() as session:
                     try:
-                        self.current_obj = session.exec(
-                            model_clz.select.where(model_clz.id == obj_id)
-                        ).one_or_none()
+                        # primary key lookup, without building a select statement
+                        obj = session.get(model_clz, obj_id)
                     except Exception as exc:
                         self.db_message = str(exc)
                         return
                     else:
-                        self.db_message = ""
-                    if self.current_obj is not None:
-                        hook = getattr(
-                            self.current_obj,
-                            "__pynecone_admin_load_object_hook__",
-                            None,
-                        )
+                        if self.db_message:
+                            self.db_message = ""
+                    if obj is not None:
+                        hook = getattr(obj, "__pynecone_admin_load_object_hook__", None)
                         if hook:
                             hook()
-                        logger.debug(f"load {obj_id}: {self.current_obj}")
+                        logger.debug("load %s: %s", obj_id, obj)
+                        self.current_obj = obj
                     else:
-                        logging.info(f"{obj_id} is not found")
+                        logger.info("%s is not found", obj_id)
                         return self.redirect_back_to_table()
 
         def save_current_obj(self):
@@ -314,8 +551,8 @@ def add_crud_routes(
             )
             if hook:
                 hook()
-            logger.info(f"persist {self.current_obj} to db")
-            with pc.session() as session:
+            logger.info("persist %s to db", self.current_obj)
+            with db_session() as session:
                 try:
                     session.add(self.current_obj)
                     session.commit()
@@ -335,8 +572,8 @@ def add_crud_routes(
                 )
                 if hook:
                     hook()
-                logger.info(f"delete {self.current_obj} from db")
-                with pc.session() as session:
+                logger.info("delete %s from db", self.current_obj)
+                with db_session() as session:
                     try:
                         session.delete(self.current_obj)
                         session.commit()
@@ -347,26 +584,24 @@ def add_crud_routes(
             return self.redirect_back_to_table()
 
         def reset(self):
-            self.current_obj = model_clz()
-            self.db_message = ""
+            blank_obj = model_clz()
+            if self.current_obj != blank_obj:
+                self.current_obj = blank_obj
+            if self.db_message:
+                self.db_message = ""
 
         def redir_to_new(self):
             return pc.redirect(self.get_current_page() + "/new")
 
         def refresh(self):
-            self._trigger_update = time.time()
+            # any change invalidates obj_page, which reads _trigger_update
+            self._trigger_update += 1
 
         def offset(self) -> int:
-            return int(
-                self.get_query_params().get("offset", QUERY_PARAM_DEFAULTS["offset"])
-            )
+            return _int_query_param(self.get_query_params(), "offset")
 
         def page_size(self) -> int:
-            return int(
-                self.get_query_params().get(
-                    "page_size", QUERY_PARAM_DEFAULTS["page_size"]
-                )
-            )
+            return _int_query_param(self.get_query_params(), "page_size")
 
         def filter_value(self) -> str:
             return self.get_query_params().get("filter", QUERY_PARAM_DEFAULTS["filter"])
@@ -374,47 +609,68 @@ def add_crud_routes(
         def obj_page(self):
             if not can_access_resource(self):
                 return []  # no viewie
-            if self.get_current_page() != "/" + utils.format.format_route(
-                f"{prefix}/{model_clz.__name__}"
-            ):
+            if self.get_current_page() != model_table_route:
                 return []  # page/table not active
             self._page_params = (
                 self.get_query_params()
             )  # cache these to redirect after editing
+            # read each query param var once
+            offset, page_size, filter_value = (
+                self.offset,
+                self.page_size,
+                self.filter_value,
+            )
+            # reading _trigger_update here also makes obj_page depend on it,
+            # so refresh() recomputes the page
             logger.debug(
-                f"get page: {self._trigger_update} {self.offset} {self.page_size} {self.filter_value}"
+                "get page: %s %s %s %s",
+                self._trigger_update,
+                offset,
+                page_size,
+                filter_value,
             )
-
-            def hook(row):
-                _hook = getattr(row, "__pynecone_admin_load_row_hook__", None)
-                if _hook:
-                    _hook()
-                return row
-
-            def filter_hook(filter_value):
-                _hook = getattr(model_clz, "__pynecone_admin_filter_where_hook__", None)
-                if _hook is not None:
-                    return _hook(filter_value)
-                # default implementation just slowly scans every column
-                return or_(
-                    col(getattr(model_clz, field_name))
-                    .cast(sqlalchemy.String)
-                    .ilike(f"%{filter_value}%")
-                    for field_name in fields(model_clz)
-                )
-
-            with pc.session() as session:
+            if page_size <= 0:
+                return []  # nothing to show, no need to query
+            # a whitespace-only filter (e.g. while clearing the input) matches all
+            filter_value = filter_value.strip()
+
+            query_params = self.get_query_params()
+            after_id = keyset_id(query_params, "after_id")
+            before_id = keyset_id(query_params, "before_id")
+            with db_session() as session:
                 select_stmt = model_clz.select
-                if self.filter_value != "":
-                    select_stmt = select_stmt.where(filter_hook(self.filter_value))
-                return [
-                    hook(row)
-                    for row in session.exec(
-                        select_stmt.order_by(model_clz.id.asc())
-                        .offset(self.offset)
-                        .limit(self.page_size)
-                    )
-                ]
+                if filter_value != "":
+                    select_stmt = select_stmt.where(filter_hook(filter_value))
+                if before_id is not None:
+                    # seek backwards from the first row of the following page
+                    rows = session.exec(
+                        select_stmt.where(model_clz.id < before_id)
+                        .order_by(model_clz.id.desc())
+                        .limit(page_size)
+                    ).all()[::-1]
+                    self._has_next_results = True
+                else:
+                    if after_id is not None:
+                        # seek past the last row of the previous page
+                        select_stmt = select_stmt.where(model_clz.id > after_id)
+                    else:
+                        select_stmt = select_stmt.offset(offset)
+                    # fetch one extra row to find out whether there is a next page
+                    rows = session.exec(
+                        select_stmt.order_by(model_clz.id.asc()).limit(page_size + 1)
+                    ).all()
+                    self._has_next_results = len(rows) > page_size
+                    rows = rows[:page_size]
+                if batch_load_hook is not None:
+                    # one call for the whole page, e.g. to load related rows
+                    # with a single query instead of one per row
+                    batch_load_hook(rows, session)
+                    return rows
+                if load_row_hook is not None:
+                    # hooks run inside the session, so they may load relationships
+                    for row in rows:
+                        load_row_hook(row)
+                return rows
 
         obj_page.__annotations__ = {"return": list[model_clz]}
 
@@ -430,28 +686,39 @@ def add_crud_routes(
         def redirect_with_params(self, url=None, **params):
             if url is None:
                 url = self.get_current_page()
-            # copy the query_params, so that new hydrate event has a delta,
+            # merge into a new dict, so that new hydrate event has a delta,
             # otherwise we update the actual dict here, and the redirect doesn't
             # trigger reassignment to router_data, since the value has no change
-            query_params = self.get_query_params().copy()
-            query_params.update(params)
-            for param, default_value in QUERY_PARAM_DEFAULTS.items():
-                # clean up URL by removing default values
-                if query_params.get(param) == default_value:
-                    query_params.pop(param, None)
-            if query_params:
-                url = url + "?{}".format(format_query_string(query_params))
-            logger.debug(f"Redirect to {url}")
+            query_params = {**self.get_query_params(), **params}
+            # clean up URL by leaving out default values
+            query_items = [
+                (param, value)
+                for param, value in query_params.items()
+                if param not in QUERY_PARAM_DEFAULTS
+                or value != QUERY_PARAM_DEFAULTS[param]
+            ]
+            if query_items:
+                url = url + "?{}".format(format_query_string(query_items))
+            logger.debug("Redirect to %s", url)
             return pc.redirect(url)
 
         def prev_page(self):
             offset = self.offset - self.page_size
-            if offset < 0:
-                offset = 0
-            return self.redirect_with_params(offset=offset)
+            if offset <= 0 or not self.obj_page:
+                # the first page needs no bound
+                return self.redirect_with_params(
+                    offset=max(offset, 0), after_id="", before_id=""
+                )
+            return self.redirect_with_params(
+                offset=offset, after_id="", before_id=self.obj_page[0].id
+            )
 
         def next_page(self):
-            return self.redirect_with_params(offset=self.offset + self.page_size)
+            # offset is kept for the Prev button, the page is found by after_id
+            params = dict(offset=self.offset + self.page_size)
+            if self.obj_page:
+                params.update(after_id=self.obj_page[-1].id, before_id="")
+            return self.redirect_with_params(**params)
 
         def set_page_size(self, v: str):
             try:
@@ -460,10 +727,13 @@ def add_crud_routes(
                 pass
 
         def set_filter_value(self, v: str):
-            return self.redirect_with_params(filter=v, offset=0)
+            return self.redirect_with_params(
+                filter=v, offset=0, after_id="", before_id=""
+            )
 
         def has_next_results(self) -> bool:
-            return len(self.obj_page) == self.page_size
+            # _has_next_results is updated when computing obj_page
+            return bool(self.obj_page) and self._has_next_results
 
         event_handlers = (
             set_subfield,
@@ -481,20 +751,30 @@ def add_crud_routes(
             set_filter_value,
         )
         substate_clz_name = f"CRUDSubStateFor{model_clz.__name__}"
-        substate_clz = type(
+        # name the handlers after the substate rather than this function's <locals>,
+        # like fix_local_event_handlers does, before the class wraps them
+        substate_full_name = ".".join(
+            (CRUDState.get_full_name(), utils.format.to_snake_case(substate_clz_name))
+        )
+        for handler in event_handlers:
+            handler.__qualname__ = f"{substate_full_name}.{handler.__name__}"
+        return type(
             substate_clz_name,
             (CRUDState,),
             {
                 "__annotations__": {
                     "current_obj": model_clz,
-                    "_trigger_update": float,
+                    "_trigger_update": int,
                     "_page_params": dict[str, t.Any],
+                    "_has_next_results": bool,
                     "db_message": str,
                     "form_message": str,
                 },
-                "current_obj": model_clz(),
-                "_trigger_update": 0.0,
+                # a fresh blank object per state, instead of deep copying a shared one
+                "current_obj": pydantic.Field(default_factory=model_clz),
+                "_trigger_update": 0,
                 "_page_params": {},
+                "_has_next_results": False,
                 "db_message": "",
                 "form_message": "",
                 "filter_value": pc.cached_var(filter_value),
@@ -505,34 +785,49 @@ def add_crud_routes(
                 **{handler.__name__: handler for handler in event_handlers},
             },
         )
-        return fix_local_event_handlers(substate_clz)
+
+    # create every substate up front and only once, every State subclass is
+    # registered as a substate
+    PER_MODEL_CRUD_STATES = types.MappingProxyType(
+        {obj.__name__: CRUDSubStateFor(model_clz=obj) for obj in objs}
+    )
 
     def substate_for(model_clz: t.Type[pc.Model]) -> t.Type[pc.State]:
-        return PER_MODEL_CRUD_STATES.setdefault(
-            model_clz.__name__,
-            CRUDSubStateFor(model_clz=model_clz),
-        )
+        return PER_MODEL_CRUD_STATES[model_clz.__name__]
 
+    # the form and table only depend on the model, build each once
+    @functools.lru_cache(maxsize=None)
     def create_update_delete(
         model_clz: t.Type[pc.Model],
     ) -> pc.Component:
         SubState = substate_for(model_clz)
-        controls = []
-        for field_name, field in fields(model_clz).items():
-            value = pc.vars.BaseVar(
-                name=f"{SubState.current_obj.name}.{field_name}",
-                type_=field.type_,
-                state=SubState.current_obj.state,
-            )
-            default_value = pc.vars.BaseVar(
-                name=json.dumps(field.default),
-                type_=field.type_,
-                state="",
-                is_local=True,
+        defaults_json = _defaults_json(model_clz)
+
+        set_subfield = SubState.set_subfield
+
+        # bind field_name per field; a lambda in the loop would see the last one.
+        # functools.partial is not used, pynecone inspects the lambda's arguments
+        def on_change_for(field_name: str) -> t.Callable[[t.Any], pc.event.EventSpec]:
+            return lambda v: set_subfield(field_name, v)
+
+        def on_set_default_for(
+            field_name: str, default_value: pc.Var
+        ) -> t.Callable[[], pc.event.EventSpec]:
+            return lambda: set_subfield(field_name, default_value)
+
+        obj_name, obj_state = SubState.current_obj.name, SubState.current_obj.state
+        # controls are dispatched on the field type inside field_component
+        controls = [
+            field_component(
+                field,
+                _field_var(obj_name, field_name, field.type_, obj_state),
+                on_change_for(field_name),
+                on_set_default_for(
+                    field_name, _local_var(defaults_json[field_name], field.type_)
+                ),
             )
-            on_change = lambda v: SubState.set_subfield(field_name, v)
-            on_set_default = lambda: SubState.set_subfield(field_name, default_value)
-            controls.append(field_component(field, value, on_change, on_set_default))
+            for field_name, field in fields(model_clz).items()
+        ]
 
         if controls:
             controls.append(
@@ -549,15 +844,39 @@ def add_crud_routes(
             on_submit=SubState.save_current_obj,
         )
 
-    def format_cell(obj, col) -> pc.Td:
-        value = pc.vars.BaseVar(
-            name=f"{obj.name}.{col}",
-            type_=obj.type_.__fields__[col].type_,
-            state=obj.state,
+    def cell_renderer(col: str, type_: type) -> t.Callable[[pc.Var], pc.Td]:
+        """Get a function rendering the col cell of a row, specialized on type_."""
+        if type_ is bool:
+
+            def format_bool_cell(obj) -> pc.Td:
+                return pc.td(
+                    pc.cond(_field_var(obj.name, col, type_, obj.state), "✅", "❌")
+                )
+
+            return format_bool_cell
+
+        def format_cell(obj) -> pc.Td:
+            return pc.td(_field_var(obj.name, col, type_, obj.state))
+
+        return format_cell
+
+    @functools.lru_cache(maxsize=None)
+    def row_cells_component(
+        model_clz: t.Type[pc.Model],
+    ) -> t.Callable[..., pc.Component]:
+        """Memoized React component rendering the cells of one table row."""
+        cell_renderers = tuple(
+            cell_renderer(name, field.type_)
+            for name, field in fields(model_clz).items()
         )
-        if value.type_ == bool:
-            value = pc.cond(value, "✅", "❌")
-        return pc.td(value)
+
+        def row_cells(row: pc.Var[dict]) -> pc.Component:
+            return pc.fragment(*[render(row) for render in cell_renderers])
+
+        # the component tag is derived from the function name, one per model
+        row_cells.__name__ = f"crud_row_cells_{model_clz.__name__}"
+        row_cells.__annotations__ = {"row": pc.Var[dict], "return": pc.Component}
+        return pc.memo(row_cells)
 
     def pagination_controls(State) -> pc.Component:
         return pc.hstack(
@@ -607,34 +926,29 @@ def add_crud_routes(
             ),
         )
 
+    @functools.lru_cache(maxsize=None)
     def table_component(model_clz: t.Type[pc.Model]) -> pc.Component:
         SubState = substate_for(model_clz)
+        columns = tuple(fields(model_clz))
+        row_cells = row_cells_component(model_clz)
+        edit_route_prefix = table_route(model_clz) + "/"
         return pc.fragment(
             filter_component(SubState),
             pagination_controls(SubState),
             pc.table_container(
                 pc.table(
                     pc.thead(
-                        pc.tr(*[pc.th(col) for col in fields(model_clz)]),
+                        pc.tr(*[pc.th(col) for col in columns]),
                     ),
                     pc.tbody(
                         pc.foreach(
                             SubState.obj_page,
                             lambda u: pc.tr(
-                                *[
-                                    format_cell(
-                                        obj=u,
-                                        col=col,
-                                    )
-                                    for col in fields(model_clz)
-                                ],
+                                # cells are a memo component, so unchanged rows
+                                # are not re-rendered
+                                row_cells(row=u),
                                 on_click=pc.redirect(
-                                    "/"
-                                    + utils.format.format_route(
-                                        f"{prefix}/{u.type_.__name__}/"
-                                    )
-                                    + "/"
-                                    + u.id.to_string().to(str),
+                                    edit_route_prefix + u.id.to_string().to(str),
                                 ),
                                 cursor="pointer",
                                 _hover={
@@ -691,6 +1005,7 @@ def add_crud_routes(
             padding_bottom="5vh",
         )
 
+    @functools.lru_cache(maxsize=None)
     def make_page(model_clz: t.Type[pc.Model]) -> pc.Component:
         table = table_component(model_clz)
 
@@ -708,6 +1023,7 @@ def add_crud_routes(
             )
         return page
 
+    @functools.lru_cache(maxsize=None)
     def make_modal(model_clz: t.Type[pc.Model]) -> pc.Component:
         crud_component = create_update_delete(model_clz)
 
@@ -722,7 +1038,7 @@ def add_crud_routes(
                     breadcrumb_links=[
                         (
                             pc.text(model_clz.__name__),
-                            "/" + utils.format.format_route(f"{prefix}/{obj.__name__}"),
+                            table_route(model_clz),
                         ),
                         (pc.text(obj_id), "#"),
                     ]
@@ -744,7 +1060,7 @@ def add_crud_routes(
                 *(
                     pc.link(
                         obj.__name__,
-                        href=utils.format.format_route(f"{prefix}/{obj.__name__}"),
+                        href=table_route(obj),
                     )
                     for obj in objs
                 ),
@@ -757,16 +1073,29 @@ def add_crud_routes(
             )
         return page
 
+    # build every page first, then register them in one pass
+    pages: list[tuple[t.Callable[[], pc.Component], dict[str, t.Any]]] = []
     for obj in objs:
-        app.add_page(
-            make_page(obj),
-            route=f"{prefix}/{obj.__name__}",
-            title=f"pynecone-admin: {obj.__name__}",
+        SubState = substate_for(obj)
+        pages.append(
+            (
+                make_page(obj),
+                dict(
+                    route=f"{prefix}/{obj.__name__}",
+                    title=f"pynecone-admin: {obj.__name__}",
+                ),
+            )
         )
-        app.add_page(
-            make_modal(obj),
-            route=f"{prefix}/{obj.__name__}/[obj_id]",
-            title=f"pynecone-admin: {obj.__name__} > Edit",
-            on_load=substate_for(obj).load_current_obj,
+        pages.append(
+            (
+                make_modal(obj),
+                dict(
+                    route=f"{prefix}/{obj.__name__}/[obj_id]",
+                    title=f"pynecone-admin: {obj.__name__} > Edit",
+                    on_load=SubState.load_current_obj,
+                ),
+            )
         )
-    app.add_page(all_models(), prefix, title="pynecone-admin: All Models")
+    pages.append((all_models(), dict(route=prefix, title="pynecone-admin: All Models")))
+    for component, page_kwargs in pages:
+        app.add_page(component, **page_kwargs)
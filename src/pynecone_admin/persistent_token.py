@@ -1,5 +1,6 @@
 """Use localStorage to persist an identifier in the browser for cross-tab sharing."""
 
+import functools
 import typing as t
 
 import pynecone as pc
@@ -22,6 +23,12 @@ PERSISTENT_TOKEN_EFFECT = PyneconeJinjaEnvironment().from_string(_EFFECT_TEMPLAT
 PERSISTENT_TOKEN_ON_CHANGE = Var.create("window.localStorage.getItem(TOKEN_KEY)")
 
 
+@functools.lru_cache(maxsize=None)
+def _render_effect(chain: str) -> str:
+    """Render the effect hook for the formatted on_change event chain."""
+    return PERSISTENT_TOKEN_EFFECT.render(on_change_trigger=f"Event([{chain}])")
+
+
 class PersistentToken(pc.Component):
     """Component triggers on_change after loading persistent_token from localStorage."""
 
@@ -39,7 +46,7 @@ class PersistentToken(pc.Component):
                 for event in self.event_triggers["on_change"].events
             ]
         )
-        return PERSISTENT_TOKEN_EFFECT.render(on_change_trigger=f"Event([{chain}])")
+        return _render_effect(chain)
 
     @classmethod
     def get_controlled_triggers(cls) -> t.Dict[str, Var]:
@@ -2,7 +2,69 @@
 import typing as t
 
 import pynecone as pc
-import pynecone_debounce_input
+from pynecone.config import get_config
+import sqlalchemy
+import sqlmodel
+
+
+# connection pool settings for non-sqlite databases
+DB_POOL_SIZE = 20
+DB_POOL_MAX_OVERFLOW = 10
+DB_POOL_RECYCLE = 1800
+DB_POOL_TIMEOUT = 30
+
+# database url -> engine
+_ENGINES: t.Dict[str, sqlalchemy.engine.Engine] = {}
+
+
+def get_engine(url: t.Optional[str] = None) -> sqlalchemy.engine.Engine:
+    """
+    Get a database engine with a connection pool for the given url.
+
+    `pc.session()` creates a new engine, and thus a new connection, for every
+    session. The engine returned here is created once per url and reused, so
+    connections are pooled across sessions.
+
+    Args:
+        url: the DB url to use, defaults to the configured `db_url`
+    """
+    url = url or get_config().db_url
+    if url is None:
+        raise ValueError("No database url configured")
+    if url not in _ENGINES:
+        sa_url = sqlalchemy.engine.make_url(url)
+        kwargs: t.Dict[str, t.Any] = {}
+        if sa_url.get_backend_name() == "sqlite":
+            kwargs["connect_args"] = {"check_same_thread": False}
+            if sa_url.database in (None, "", ":memory:"):
+                # in-memory databases only exist for a single connection
+                kwargs["poolclass"] = sqlalchemy.pool.StaticPool
+            else:
+                kwargs["poolclass"] = sqlalchemy.pool.QueuePool
+        else:
+            kwargs.update(
+                poolclass=sqlalchemy.pool.QueuePool,
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_POOL_MAX_OVERFLOW,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_timeout=DB_POOL_TIMEOUT,
+                # check connections on checkout, pooled ones may have been dropped
+                pool_pre_ping=True,
+            )
+        _ENGINES[url] = sqlmodel.create_engine(url, echo=False, **kwargs)
+    return _ENGINES[url]
+
+
+def db_session(url: t.Optional[str] = None) -> sqlmodel.Session:
+    """
+    Get a session using the pooled engine for the given url.
+
+    Drop-in replacement for `pc.session()`.
+
+    Args:
+        url: the DB url to use, defaults to the configured `db_url`
+    """
+    return sqlmodel.Session(get_engine(url))
 
 
 def fix_local_event_handlers(State: t.Type[pc.State]) -> t.Type[pc.State]:
@@ -14,12 +76,10 @@ def fix_local_event_handlers(State: t.Type[pc.State]) -> t.Type[pc.State]:
 
     This works around a pynecone issue.
     """
-    for attr_name in dir(State):
-        attr_value = getattr(State, attr_name)
-        if isinstance(attr_value, pc.event.EventHandler):
-            fn = attr_value.fn
-            if "<locals>" in fn.__qualname__.split("."):
-                fn.__qualname__ = State.get_full_name() + f".{fn.__name__}"
+    for handler in State.event_handlers.values():
+        fn = handler.fn
+        if "<locals>" in fn.__qualname__.split("."):
+            fn.__qualname__ = State.get_full_name() + f".{fn.__name__}"
     return State
 
 
@@ -51,6 +111,18 @@ def add_computed_var(State: t.Type[pc.State]):
     return dec
 
 
+def add_backend_var(State: t.Type[pc.State], name: str, default_value: t.Any) -> None:
+    """
+    Add a backend-only var to the given state.
+
+    Backend vars (names starting with an underscore) may be used as cached var
+    dependencies, but are never sent to the frontend.
+    """
+    if not name.startswith("_"):
+        raise ValueError(f"Backend var {name!r} must start with an underscore")
+    State.backend_vars[name] = default_value
+
+
 def add_event_handler(State: t.Type[pc.State]):
     """
     Add a func to the given state as an EventHandler.
@@ -72,6 +144,9 @@ def add_event_handler(State: t.Type[pc.State]):
 
 
 def debounce_input(*args, **kwargs) -> pc.Component:
+    # imported on first use, only pages with form inputs need it
+    import pynecone_debounce_input
+
     return pynecone_debounce_input.debounce_input(*args, **kwargs)
 
 
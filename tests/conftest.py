@@ -0,0 +1,26 @@
+import pytest
+import sqlalchemy.pool
+import sqlmodel
+
+from pynecone_admin.auth_models import pca_AuthSession, pca_User
+
+
+@pytest.fixture
+def engine():
+    engine = sqlmodel.create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=sqlalchemy.pool.StaticPool,
+    )
+    sqlmodel.SQLModel.metadata.create_all(
+        engine,
+        tables=[pca_User.__table__, pca_AuthSession.__table__],
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    with sqlmodel.Session(engine) as session:
+        yield session
@@ -0,0 +1,102 @@
+import datetime
+
+import pynecone as pc
+import pytest
+import sqlalchemy
+import sqlmodel
+
+from pynecone_admin import auth
+from pynecone_admin.auth_models import pca_AuthSession, pca_User
+
+
+@auth.authenticated_user_id
+class AuthState(pc.State):
+    pass
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    monkeypatch.setattr(auth, "db_session", lambda: sqlmodel.Session(engine))
+    monkeypatch.setattr(auth, "_AUTH_CACHE", {})
+    return engine
+
+
+@pytest.fixture
+def user(session, db):
+    user = pca_User(username="admin", password_hash="x", enabled=True, admin=True)
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def navigate(state, path):
+    state.router_data = {**state.router_data, pc.constants.RouteVar.PATH: path}
+    state.get_delta()
+    state.clean()
+
+
+@pytest.fixture
+def state(user):
+    state = AuthState()
+    state.persistent_token = "token"
+    navigate(state, "/")
+    assert state.authenticated_user_id == -1
+    AuthState._login(state, user.id)
+    state.get_delta()
+    state.clean()
+    assert state.authenticated_user_id == user.id
+    return state
+
+
+def expire_lookup_cache(monkeypatch):
+    later = datetime.datetime.now(datetime.timezone.utc) + auth.AUTH_CACHE_DELTA
+    monkeypatch.setattr(auth, "_utcnow", lambda: later + datetime.timedelta(seconds=1))
+
+
+def test_revoked_session_is_noticed_on_navigation(state, session):
+    auth_session = session.exec(
+        pca_AuthSession.select.where(pca_AuthSession.session_id == "token")
+    ).one()
+    # as deleted from the pca_AuthSession CRUD page
+    session.delete(auth_session)
+    session.commit()
+    assert "token" not in auth._AUTH_CACHE
+    navigate(state, "/protected")
+    assert state.authenticated_user_id == -1
+
+
+def test_expired_session_is_noticed_on_navigation(state, session, monkeypatch):
+    # bulk update, as from another process: the ORM events do not fire
+    session.exec(
+        sqlalchemy.update(pca_AuthSession)
+        .where(pca_AuthSession.session_id == "token")
+        .values(expiration=datetime.datetime(2000, 1, 1))
+    )
+    session.commit()
+    navigate(state, "/protected")
+    # still cached
+    assert state.authenticated_user_id >= 0
+    expire_lookup_cache(monkeypatch)
+    navigate(state, "/")
+    assert state.authenticated_user_id == -1
+
+
+def test_get_authenticated_user_after_cache_eviction(state, user, monkeypatch):
+    auth._AUTH_CACHE.clear()
+    authenticated_user = auth.get_authenticated_user("token")
+    assert authenticated_user is not None
+    assert authenticated_user.id == user.id
+
+
+def test_get_authenticated_user_reads_current_flags(state, user, session):
+    assert auth.get_authenticated_user("token").admin
+    # as saved from the pca_User CRUD page, while the auth session is cached
+    user.admin = False
+    user.enabled = False
+    session.add(user)
+    session.commit()
+    assert "token" in auth._AUTH_CACHE
+    authenticated_user = auth.get_authenticated_user("token")
+    assert not authenticated_user.admin
+    assert not authenticated_user.enabled
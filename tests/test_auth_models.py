@@ -0,0 +1,31 @@
+import pytest
+
+from pynecone_admin.auth_models import pca_User, pwd_context
+
+
+def test_save_new_user_hashes_plaintext_password(session):
+    user = pca_User(username="admin", password_hash="hunter2", enabled=True)
+    pca_User.__pynecone_admin_save_object_hook__(user)
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    assert user.password_hash != "hunter2"
+    assert pwd_context.identify(user.password_hash) == "argon2"
+    assert user.verify("hunter2")
+    assert not user.verify("hunter3")
+
+
+@pytest.mark.parametrize("ident", ["2", "2a", "2b", "2x", "2y"])
+def test_existing_bcrypt_hash_is_not_rehashed(ident):
+    bcrypt_hash = "$2b$04$" + "a" * 53
+    password_hash = f"${ident}$" + bcrypt_hash[4:]
+    user = pca_User(username="legacy", password_hash=password_hash)
+    user.do_hash_password()
+    assert user.password_hash == password_hash
+
+
+def test_existing_argon2_hash_is_not_rehashed():
+    password_hash = pwd_context.hash("hunter2")
+    user = pca_User(username="user", password_hash=password_hash)
+    user.do_hash_password()
+    assert user.password_hash == password_hash
@@ -0,0 +1,62 @@
+import enum
+import typing as t
+
+import pynecone as pc
+import pytest
+import sqlmodel
+
+from pynecone_admin.auth_models import pca_User
+from pynecone_admin.crud import _default_filter_hook
+
+
+class Color(enum.Enum):
+    red = "red"
+    blue = "blue"
+
+
+class FilterHero(pc.Model, table=True):
+    name: str
+    secret_name: str
+    age: t.Optional[int] = None
+    color: t.Optional[Color] = None
+
+
+@pytest.fixture
+def heroes(engine, session):
+    FilterHero.__table__.create(engine)
+    session.add_all(
+        [
+            FilterHero(name=f"hero{n}", secret_name=f"secret{n}", age=30 + n)
+            for n in range(5)
+        ]
+    )
+    session.commit()
+
+
+def filter_names(session, model_clz, filter_value):
+    return sorted(
+        getattr(row, "name", None) or row.username
+        for row in session.exec(
+            sqlmodel.select(model_clz).where(
+                _default_filter_hook(model_clz)(filter_value)
+            )
+        )
+    )
+
+
+def test_default_filter_matches_str_fields(session, heroes):
+    assert filter_names(session, FilterHero, "hero3") == ["hero3"]
+    assert filter_names(session, FilterHero, "SECRET1") == ["hero1"]
+    assert filter_names(session, FilterHero, "nobody") == []
+
+
+def test_default_filter_matches_int_fields_by_equality(session, heroes):
+    assert filter_names(session, FilterHero, "32") == ["hero2"]
+    # id 3 is hero2
+    assert filter_names(session, FilterHero, "3") == ["hero2", "hero3"]
+
+
+def test_default_filter_matches_pca_user_username(session):
+    session.add(pca_User(username="someone", password_hash="x"))
+    session.commit()
+    assert filter_names(session, pca_User, "some") == ["someone"]